@@ -1,62 +1,131 @@
 import asyncio
+import heapq
 import time
 from typing import Any
 
 
 class TTLCache:
-    """In-memory TTL cache with stale-serving support."""
+    """In-memory TTL cache with stale-while-revalidate support.
+
+    Entries are fresh for the TTL, then kept as stale for up to `stale_ttl`
+    seconds after being set so callers can serve them while refreshing.
+    With `max_entries`, the least recently used entry is evicted once the
+    cache is full.
+    """
 
     MIN_TTL = 1800  # 30 minutes minimum
 
-    def __init__(self, default_ttl: int = 1800):
-        self._store: dict[str, tuple[Any, float]] = {}  # key -> (value, expiry)
+    def __init__(
+        self,
+        default_ttl: int = 1800,
+        stale_ttl: int = 86400,
+        max_entries: int | None = None,
+    ):
+        # key -> (value, fresh_until, stale_until)
+        self._store: dict[str, tuple[Any, float, float]] = {}
+        # (stale_until, key) min-heap; entries superseded by a later set() are
+        # skipped at cleanup time by comparing against the stored expiry
+        self._expiry_heap: list[tuple[float, str]] = []
         self._default_ttl = max(default_ttl, self.MIN_TTL)
+        self._stale_ttl = stale_ttl
+        self._max_entries = max_entries
         self._cleanup_task: asyncio.Task | None = None
+        # Set when an entry becomes the next to expire, to wake the cleanup
+        # loop; created by the loop itself so it binds to the running loop
+        self._wake: asyncio.Event | None = None
+
+    def get(self, key: str, now: float | None = None) -> Any | None:
+        """Return cached value if still fresh, else None.
+
+        `now` lets a caller doing several lookups read the clock only once.
+        """
+        value, needs_refresh = self.get_swr(key, now)
+        return None if needs_refresh else value
 
-    def get(self, key: str) -> Any | None:
-        """Return cached value if not expired, else None."""
+    def get_swr(self, key: str, now: float | None = None) -> tuple[Any | None, bool]:
+        """Return (value, needs_refresh).
+
+        value is None if the key is missing or past its stale window;
+        needs_refresh is True when a stale value is being returned.
+        """
         entry = self._store.get(key)
         if entry is None:
-            return None
-        value, expiry = entry
-        if time.monotonic() > expiry:
+            return None, False
+        value, fresh_until, stale_until = entry
+        if now is None:
+            now = time.monotonic()
+        if now > stale_until:
             # Lazy eviction
             del self._store[key]
-            return None
-        return value
-
-    def get_with_stale(self, key: str) -> tuple[Any | None, bool]:
-        """Return (value, is_stale). Returns expired entries as fallback."""
-        entry = self._store.get(key)
-        if entry is None:
             return None, False
-        value, expiry = entry
-        is_stale = time.monotonic() > expiry
-        return value, is_stale
+        if self._max_entries is not None:
+            # Move to the end of the (insertion-ordered) dict: most recently used
+            self._store[key] = self._store.pop(key)
+        return value, now > fresh_until
 
     def set(self, key: str, value: Any, ttl: int | None = None) -> None:
         """Store a value with TTL."""
         effective_ttl = max(ttl or self._default_ttl, self.MIN_TTL)
-        self._store[key] = (value, time.monotonic() + effective_ttl)
+        now = time.monotonic()
+        fresh_until = now + effective_ttl
+        stale_until = now + max(effective_ttl, self._stale_ttl)
+        store = self._store
+        store.pop(key, None)
+        if self._max_entries is not None:
+            while len(store) >= self._max_entries:
+                # Evict the least recently used entry (first in the dict)
+                del store[next(iter(store))]
+        store[key] = (value, fresh_until, stale_until)
+        heap = self._expiry_heap
+        heapq.heappush(heap, (stale_until, key))
+        if self._max_entries is not None and len(heap) > 2 * self._max_entries:
+            # Evicted and superseded keys leave dead heap entries behind;
+            # rebuild from the live entries so the heap stays bounded too
+            heap[:] = [(entry[2], k) for k, entry in store.items()]
+            heapq.heapify(heap)
+        if self._wake is not None and heap[0] == (stale_until, key):
+            self._wake.set()
 
     def _cleanup(self) -> None:
-        """Remove all expired entries."""
+        """Remove all entries past their stale window."""
         now = time.monotonic()
-        expired = [k for k, (_, exp) in self._store.items() if now > exp]
-        for k in expired:
-            del self._store[k]
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            expiry, key = heapq.heappop(heap)
+            entry = self._store.get(key)
+            if entry is not None and entry[2] == expiry:
+                del self._store[key]
 
-    async def start_cleanup_loop(self, interval: int = 300) -> None:
-        """Background cleanup every `interval` seconds (default 5 min)."""
+    async def start_cleanup_loop(self, max_interval: int = 3600) -> None:
+        """Background cleanup, sleeping until the next entry expires."""
+        self._wake = wake = asyncio.Event()
         while True:
-            await asyncio.sleep(interval)
             self._cleanup()
+            now = time.monotonic()
+            if self._expiry_heap:
+                delay = min(max(self._expiry_heap[0][0] - now, 1), max_interval)
+            else:
+                delay = max_interval
+            wake.clear()
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=delay)
+            except TimeoutError:
+                pass
 
     def start_background_cleanup(self) -> None:
         """Start the background cleanup task."""
-        if self._cleanup_task is None or self._cleanup_task.done():
+        task = self._cleanup_task
+        # A task left over from an earlier event loop will never run again
+        if (
+            task is None
+            or task.done()
+            or task.get_loop() is not asyncio.get_running_loop()
+        ):
             self._cleanup_task = asyncio.create_task(self.start_cleanup_loop())
 
 
-# Module-level singleton
+# Module-level singletons
 stats_cache = TTLCache()
+# Rendered cards are cheap to rebuild, so they are never served stale. Keys
+# come straight from query options, so the entry count is capped.
+svg_cache = TTLCache(stale_ttl=0, max_entries=1024)
@@ -1,20 +1,42 @@
 import asyncio
 import logging
+import math
 import os
-import re
 from dataclasses import dataclass, field
+from functools import lru_cache
+from urllib.parse import urlencode
 
 import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 
 GITHUB_API = "https://api.github.com"
 GITHUB_GRAPHQL = "https://api.github.com/graphql"
-USERNAME_RE = re.compile(r"^[a-zA-Z0-9](?:[a-zA-Z0-9]|-(?=[a-zA-Z0-9])){0,38}$")
 MAX_REPO_PAGES = 10
 
+# Fetch the REST profile alongside the GraphQL query so a fallback to REST
+# doesn't pay for it sequentially. The fallback only happens when the token
+# is rejected (401), so this helps only with a misconfigured token; otherwise
+# it spends an extra core API request per cache miss. Off by default.
+PREFETCH_PROFILE = os.environ.get("GITHUB_PREFETCH_PROFILE", "").strip() == "1"
+
+# Read once at import; both API clients are built with this token
+_TOKEN = os.environ.get("GITHUB_TOKEN", "").strip() or None
+
+# A REST cache miss fans out to at most 15 concurrent requests (up to
+# MAX_REPO_PAGES repo pages, events and four searches). Over HTTP/2 those
+# multiplex onto one connection, and even over HTTP/1.1 a single miss fits
+# in the pool. The longer keepalive holds connections open between
+# unrelated badge hits.
+CLIENT_LIMITS = httpx.Limits(
+    max_keepalive_connections=10,
+    max_connections=20,
+    keepalive_expiry=30.0,
+)
+
 STATS_GRAPHQL_QUERY = """
-query($username: String!) {
+query($username: String!, $mergedQuery: String!, $prsQuery: String!) {
   user(login: $username) {
     name
     avatarUrl
@@ -40,10 +62,10 @@ query($username: String!) {
       totalRepositoriesWithContributedCommits
     }
   }
-  merged: search(query: "author:$USERNAME type:pr is:merged", type: ISSUE) {
+  merged: search(query: $mergedQuery, type: ISSUE) {
     issueCount
   }
-  total_prs: search(query: "author:$USERNAME type:pr", type: ISSUE) {
+  total_prs: search(query: $prsQuery, type: ISSUE) {
     issueCount
   }
 }
@@ -74,7 +96,7 @@ class GitHubUserNotFoundError(Exception):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class UserStats:
     username: str = ""
     name: str = ""
@@ -92,161 +114,299 @@ class UserStats:
     errors: list[str] = field(default_factory=list)
 
 
+def create_rest_client() -> httpx.AsyncClient:
+    """Create the long-lived client used for REST API calls."""
+    headers = {"Accept": "application/vnd.github.v3+json"}
+
+    token = _get_github_token()
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+
+    return httpx.AsyncClient(
+        base_url=GITHUB_API,
+        headers=headers,
+        timeout=15.0,
+        limits=CLIENT_LIMITS,
+        http2=True,
+        follow_redirects=True,
+    )
+
+
+def create_graphql_client() -> httpx.AsyncClient:
+    """Create the long-lived client used for GraphQL API calls."""
+    headers = {"Accept": "application/json"}
+
+    token = _get_github_token()
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+
+    return httpx.AsyncClient(
+        headers=headers,
+        timeout=15.0,
+        limits=CLIENT_LIMITS,
+        http2=True,
+    )
+
+
 def validate_username(username: str) -> bool:
-    """Check if username matches GitHub's username rules."""
-    return bool(USERNAME_RE.match(username))
+    """Check if username matches GitHub's username rules.
+
+    1-39 ASCII alphanumerics or single hyphens, not starting or ending with
+    a hyphen (the regex ^[a-zA-Z0-9](?:[a-zA-Z0-9]|-(?=[a-zA-Z0-9])){0,38}$),
+    checked without the regex engine.
+    """
+    if not 0 < len(username) <= 39 or not username.isascii():
+        return False
+    if username[0] == "-" or username[-1] == "-":
+        return False
+    if username.isalnum():
+        return True
+    prev_dash = False
+    for c in username:
+        if c == "-":
+            if prev_dash:
+                return False
+            prev_dash = True
+        elif c.isalnum():
+            prev_dash = False
+        else:
+            return False
+    return True
 
 
 def _get_github_token() -> str | None:
-    """Get GitHub token from environment."""
-    return os.environ.get("GITHUB_TOKEN", "").strip() or None
+    """Get the GitHub token read from the environment at import time."""
+    return _TOKEN
 
 
-async def fetch_user_stats(username: str) -> UserStats:
-    """Fetch all stats for a GitHub user. Uses GraphQL if a token is available."""
+async def fetch_user_stats(
+    username: str,
+    rest_client: httpx.AsyncClient,
+    graphql_client: httpx.AsyncClient,
+) -> UserStats:
+    """Fetch all stats for a GitHub user.
+
+    A single GraphQL document is used whenever a token is available; the
+    REST fan-out only runs without a token or when the token is rejected.
+    """
     if not validate_username(username):
         raise GitHubUserNotFoundError(f"Invalid username: {username}")
 
-    token = _get_github_token()
-    if token:
-        return await _fetch_user_stats_graphql(username, token)
-    return await _fetch_user_stats_rest(username)
+    if not _get_github_token():
+        return await _fetch_user_stats_rest(rest_client, username)
 
+    profile = None
+    profile_task = None
+    if PREFETCH_PROFILE:
+        profile = UserStats(username=username)
+        profile_task = asyncio.create_task(
+            _fetch_user_profile(rest_client, username, profile)
+        )
 
-async def _fetch_user_stats_graphql(username: str, token: str) -> UserStats:
-    """Fetch stats via GitHub GraphQL API (requires PAT)."""
-    stats = UserStats(username=username)
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json",
-    }
+    try:
+        stats = await _fetch_user_stats_graphql(graphql_client, rest_client, username)
+    except BaseException:
+        if profile_task is not None:
+            _discard_task(profile_task)
+        raise
 
-    # The search query strings need the username substituted as literals
-    # (GraphQL variables don't work inside search query strings)
-    query = STATS_GRAPHQL_QUERY.replace("$USERNAME", username)
+    if stats is not None:
+        if profile_task is not None:
+            _discard_task(profile_task)
+        return stats
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        try:
-            resp = await client.post(
-                GITHUB_GRAPHQL,
-                headers=headers,
-                json={"query": query, "variables": {"username": username}},
-            )
-            if resp.status_code == 401:
-                logger.warning("GitHub token is invalid, falling back to REST API")
-                return await _fetch_user_stats_rest(username)
-            if resp.status_code == 403:
-                _check_rate_limit(resp)
-            resp.raise_for_status()
-
-            data = resp.json()
-
-            if "errors" in data:
-                errors = data["errors"]
-                # Check for user not found
-                for err in errors:
-                    if err.get("type") == "NOT_FOUND":
-                        raise GitHubUserNotFoundError(f"User not found: {username}")
-                logger.warning("GraphQL errors for %s: %s", username, errors)
-                # Fall back to REST if GraphQL fails
-                return await _fetch_user_stats_rest(username)
-
-            user = data["data"]["user"]
-            if user is None:
-                raise GitHubUserNotFoundError(f"User not found: {username}")
+    if profile_task is not None:
+        await profile_task
+    return await _fetch_user_stats_rest(rest_client, username, profile)
 
-            contrib = user["contributionsCollection"]
 
-            stats.name = user.get("name") or username
-            stats.avatar_url = user.get("avatarUrl", "")
-            stats.followers = user["followers"]["totalCount"]
-            stats.total_repos = user["repositories"]["totalCount"]
-            stats.total_commits = (
-                contrib["totalCommitContributions"]
-                + contrib["restrictedContributionsCount"]
-            )
-            stats.total_prs = data["data"]["total_prs"]["issueCount"]
-            stats.total_prs_merged = data["data"]["merged"]["issueCount"]
-            stats.total_issues = contrib["totalIssueContributions"]
-            stats.total_reviews = contrib["totalPullRequestReviewContributions"]
-            stats.contributions = contrib["totalRepositoriesWithContributedCommits"]
-
-            # Sum stars from repos (first page already in response)
-            repos_data = user["repositories"]
-            total_stars = sum(node["stargazerCount"] for node in repos_data["nodes"])
-
-            # Paginate remaining repos for star counts
-            page_info = repos_data["pageInfo"]
-            page = 1
-            while page_info["hasNextPage"] and page < MAX_REPO_PAGES:
-                page += 1
-                page_resp = await client.post(
-                    GITHUB_GRAPHQL,
-                    headers=headers,
-                    json={
-                        "query": REPOS_PAGE_GRAPHQL_QUERY,
-                        "variables": {
-                            "username": username,
-                            "cursor": page_info["endCursor"],
-                        },
-                    },
-                )
-                if page_resp.status_code == 403:
-                    _check_rate_limit(page_resp)
-                page_resp.raise_for_status()
-                page_data = page_resp.json()
-                if "errors" in page_data:
-                    break
-                repos_page = page_data["data"]["user"]["repositories"]
-                total_stars += sum(
-                    node["stargazerCount"] for node in repos_page["nodes"]
-                )
-                page_info = repos_page["pageInfo"]
-
-            stats.total_stars = total_stars
-
-        except (GitHubUserNotFoundError, GitHubRateLimitError):
-            raise
-        except Exception as e:
-            logger.warning(
-                "GraphQL fetch failed for %s: %s, falling back to REST", username, e
-            )
-            return await _fetch_user_stats_rest(username)
+def _discard_task(task: asyncio.Task) -> None:
+    """Cancel a speculative task whose result is no longer needed."""
+    if task.done():
+        # Mark any exception as retrieved so it isn't reported as unhandled
+        if not task.cancelled():
+            task.exception()
+    else:
+        task.cancel()
+
+
+async def _fetch_user_stats_graphql(
+    client: httpx.AsyncClient, rest_client: httpx.AsyncClient, username: str
+) -> UserStats | None:
+    """Fetch stats via GitHub GraphQL API (the client must carry a PAT).
+
+    Returns None if GitHub rejects the token, so the caller can fall back
+    to the REST API.
+    """
+    stats = UserStats(username=username)
+
+    # Whole search strings go in as variables, so the query document itself
+    # is a constant and never needs the username substituted into it
+    resp = await client.post(
+        GITHUB_GRAPHQL,
+        json={
+            "query": STATS_GRAPHQL_QUERY,
+            "variables": {
+                "username": username,
+                "mergedQuery": f"author:{username} type:pr is:merged",
+                "prsQuery": f"author:{username} type:pr",
+            },
+        },
+    )
+    if resp.status_code == 401:
+        logger.warning("GitHub token is invalid, falling back to REST API")
+        return None
+    if resp.status_code == 403:
+        _check_rate_limit(resp)
+    resp.raise_for_status()
+
+    data = orjson.loads(resp.content)
+    result = data.get("data") or {}
+
+    if "errors" in data:
+        errors = data["errors"]
+        for err in errors:
+            if err.get("type") == "NOT_FOUND":
+                raise GitHubUserNotFoundError(f"User not found: {username}")
+            if err.get("type") == "RATE_LIMITED":
+                raise GitHubRateLimitError("GitHub API rate limit exceeded")
+        # Partial errors (e.g. a failed search) still leave usable data,
+        # which beats re-fetching everything through the REST fan-out
+        logger.warning("GraphQL errors for %s: %s", username, errors)
+        if not result:
+            raise RuntimeError(f"GraphQL query failed for {username}: {errors}")
+
+    user = result.get("user")
+    if user is None:
+        # Without a NOT_FOUND error (handled above), a null user means the
+        # lookup itself failed, e.g. FORBIDDEN or a timeout
+        if "errors" in data:
+            raise RuntimeError(f"GraphQL user lookup failed for {username}")
+        raise GitHubUserNotFoundError(f"User not found: {username}")
+
+    # Partial errors null out the failing field (a heavy user's
+    # contributionsCollection timing out is the common case); leave those
+    # counts at zero and record the failure rather than dropping the card
+    stats.name = user.get("name") or username
+    stats.avatar_url = user.get("avatarUrl", "")
+    followers = user.get("followers")
+    if followers is not None:
+        stats.followers = followers["totalCount"]
+    else:
+        stats.errors.append("followers: missing from GraphQL response")
+    contrib = user.get("contributionsCollection")
+    if contrib is not None:
+        stats.total_commits = (
+            contrib["totalCommitContributions"]
+            + contrib["restrictedContributionsCount"]
+        )
+        stats.total_issues = contrib["totalIssueContributions"]
+        stats.total_reviews = contrib["totalPullRequestReviewContributions"]
+        stats.contributions = contrib["totalRepositoriesWithContributedCommits"]
+    else:
+        stats.errors.append("contributions: missing from GraphQL response")
+
+    # A failed search alias comes back null; fetch just that count from the
+    # REST search API rather than caching a zero as if it were real
+    refills = []
+    if result.get("total_prs") is not None:
+        stats.total_prs = result["total_prs"]["issueCount"]
+    else:
+        refills.append(_fetch_search_prs(rest_client, username, stats))
+    if result.get("merged") is not None:
+        stats.total_prs_merged = result["merged"]["issueCount"]
+    else:
+        refills.append(_fetch_search_merged_prs(rest_client, username, stats))
+    for outcome in await asyncio.gather(*refills, return_exceptions=True):
+        if isinstance(outcome, Exception):
+            stats.errors.append(f"search: {outcome}")
+
+    repos_data = user.get("repositories")
+    if repos_data is not None:
+        stats.total_repos = repos_data["totalCount"]
+        stats.total_stars = await _fetch_graphql_stars(
+            client, username, repos_data, stats
+        )
+    else:
+        stats.errors.append("repos: missing from GraphQL response")
 
     stats.from_graphql = True
     logger.info("Fetched stats for %s via GraphQL", username)
     return stats
 
 
-async def _fetch_user_stats_rest(username: str) -> UserStats:
-    """Fetch stats via REST API (unauthenticated fallback)."""
-    stats = UserStats(username=username)
-    headers = {"Accept": "application/vnd.github.v3+json"}
+async def _fetch_graphql_stars(
+    client: httpx.AsyncClient, username: str, repos_data: dict, stats: UserStats
+) -> int:
+    """Sum stars over owned repos, starting from the query's first page."""
+    # Individual nodes can also come back null under partial errors
+    nodes = repos_data["nodes"]
+    total_stars = sum([node["stargazerCount"] for node in nodes if node])
 
-    token = _get_github_token()
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
+    # Page through the rest by cursor. This stays on GraphQL, rather than
+    # REST offsets, to keep the token owner's private repos and the
+    # stars-descending order that makes MAX_REPO_PAGES drop the least-starred.
+    page_info = repos_data["pageInfo"]
+    page = 1
+    try:
+        while page_info["hasNextPage"] and page < MAX_REPO_PAGES:
+            page += 1
+            page_resp = await client.post(
+                GITHUB_GRAPHQL,
+                json={
+                    "query": REPOS_PAGE_GRAPHQL_QUERY,
+                    "variables": {
+                        "username": username,
+                        "cursor": page_info["endCursor"],
+                    },
+                },
+            )
+            if page_resp.status_code == 403:
+                _check_rate_limit(page_resp)
+            page_resp.raise_for_status()
+            page_data = orjson.loads(page_resp.content)
+            if "errors" in page_data:
+                raise RuntimeError(f"GraphQL errors: {page_data['errors']}")
+            repos_page = page_data["data"]["user"]["repositories"]
+            total_stars += sum(
+                [node["stargazerCount"] for node in repos_page["nodes"] if node]
+            )
+            page_info = repos_page["pageInfo"]
+    except GitHubRateLimitError:
+        raise
+    except Exception as e:
+        logger.warning("Failed to paginate repos for %s: %s", username, e)
+        stats.errors.append(f"repos: {e}")
+
+    return total_stars
 
-    async with httpx.AsyncClient(
-        base_url=GITHUB_API,
-        headers=headers,
-        timeout=15.0,
-        follow_redirects=True,
-    ) as client:
-        await asyncio.gather(
-            _fetch_core_data(client, username, stats),
-            _fetch_search_data(client, username, stats),
-        )
+
+async def _fetch_user_stats_rest(
+    client: httpx.AsyncClient, username: str, profile: UserStats | None = None
+) -> UserStats:
+    """Fetch stats via REST API (unauthenticated fallback).
+
+    `profile` is stats already populated by _fetch_user_profile, if any.
+    """
+    stats = profile or UserStats(username=username)
+    await asyncio.gather(
+        _fetch_core_data(client, username, stats, fetch_profile=profile is None),
+        _fetch_search_data(client, username, stats),
+    )
 
     return stats
 
 
 async def _fetch_core_data(
-    client: httpx.AsyncClient, username: str, stats: UserStats
+    client: httpx.AsyncClient,
+    username: str,
+    stats: UserStats,
+    fetch_profile: bool = True,
 ) -> None:
     """Fetch data from core API endpoints (shared rate limit pool)."""
     # User profile first - if this 404s, user doesn't exist
-    await _fetch_user_profile(client, username, stats)
+    if fetch_profile:
+        await _fetch_user_profile(client, username, stats)
 
     # Then repos and events in parallel
     await asyncio.gather(
@@ -266,7 +426,7 @@ async def _fetch_user_profile(
         if resp.status_code == 403:
             _check_rate_limit(resp)
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
         stats.name = data.get("name") or username
         stats.followers = data.get("followers", 0)
         stats.total_repos = data.get("public_repos", 0)
@@ -282,26 +442,14 @@ async def _fetch_repos(
     client: httpx.AsyncClient, username: str, stats: UserStats
 ) -> None:
     """Fetch all repos to count total stars (paginated)."""
-    total_stars = 0
-    page = 1
     try:
-        while page <= MAX_REPO_PAGES:
-            resp = await client.get(
-                f"/users/{username}/repos",
-                params={"per_page": 100, "page": page, "type": "owner"},
-            )
-            if resp.status_code == 403:
-                _check_rate_limit(resp)
-            resp.raise_for_status()
-            repos = resp.json()
-            if not repos:
-                break
-            for repo in repos:
-                total_stars += repo.get("stargazers_count", 0)
-            if len(repos) < 100:
-                break
-            page += 1
-        stats.total_stars = total_stars
+        if stats.total_repos:
+            # The profile has already been fetched, so the page count is known
+            pages = min(math.ceil(stats.total_repos / 100), MAX_REPO_PAGES)
+            stats.total_stars = await _fetch_repo_stars(client, username, pages)
+        else:
+            # No repo count (or the profile fetch failed): page until a short page
+            stats.total_stars = await _fetch_repo_stars_sequential(client, username)
     except GitHubRateLimitError:
         raise
     except Exception as e:
@@ -309,6 +457,46 @@ async def _fetch_repos(
         stats.errors.append(f"repos: {e}")
 
 
+async def _fetch_repo_stars(
+    client: httpx.AsyncClient, username: str, pages: int
+) -> int:
+    """Sum stargazers over the first `pages` pages of owned repos, concurrently."""
+
+    async def fetch_page(page: int) -> int:
+        resp = await client.get(
+            f"/users/{username}/repos",
+            params={"per_page": 100, "page": page, "type": "owner"},
+        )
+        if resp.status_code == 403:
+            _check_rate_limit(resp)
+        resp.raise_for_status()
+        repos = orjson.loads(resp.content)
+        return sum([r["stargazers_count"] for r in repos if "stargazers_count" in r])
+
+    counts = await asyncio.gather(*(fetch_page(p) for p in range(1, pages + 1)))
+    return sum(counts)
+
+
+async def _fetch_repo_stars_sequential(client: httpx.AsyncClient, username: str) -> int:
+    """Sum stargazers over owned repos page by page, stopping at a short page."""
+    total_stars = 0
+    for page in range(1, MAX_REPO_PAGES + 1):
+        resp = await client.get(
+            f"/users/{username}/repos",
+            params={"per_page": 100, "page": page, "type": "owner"},
+        )
+        if resp.status_code == 403:
+            _check_rate_limit(resp)
+        resp.raise_for_status()
+        repos = orjson.loads(resp.content)
+        total_stars += sum(
+            [r["stargazers_count"] for r in repos if "stargazers_count" in r]
+        )
+        if len(repos) < 100:
+            break
+    return total_stars
+
+
 async def _fetch_events(
     client: httpx.AsyncClient, username: str, stats: UserStats
 ) -> None:
@@ -320,18 +508,18 @@ async def _fetch_events(
         if resp.status_code == 403:
             _check_rate_limit(resp)
         resp.raise_for_status()
-        events = resp.json()
-
-        reviews = 0
-        contributed_repos = set()
-        for event in events:
-            event_type = event.get("type", "")
-            repo_name = event.get("repo", {}).get("name", "")
+        events = orjson.loads(resp.content)
 
-            if event_type == "PullRequestReviewEvent":
-                reviews += 1
-            if repo_name and not repo_name.startswith(f"{username}/"):
-                contributed_repos.add(repo_name)
+        reviews = sum(
+            [1 for event in events if event.get("type") == "PullRequestReviewEvent"]
+        )
+        own_prefix = f"{username}/"
+        contributed_repos = {
+            repo_name
+            for event in events
+            if (repo_name := event.get("repo", {}).get("name", ""))
+            and not repo_name.startswith(own_prefix)
+        }
 
         stats.total_reviews = reviews
         stats.contributions = len(contributed_repos)
@@ -362,10 +550,7 @@ async def _fetch_search_commits(
 ) -> None:
     """Fetch total commit count via search API."""
     try:
-        resp = await client.get(
-            "/search/commits",
-            params={"q": f"author:{username}", "per_page": 1},
-        )
+        resp = await client.get(_search_url("/search/commits", username, ""))
         if resp.status_code == 403:
             _check_rate_limit(resp)
         if resp.status_code == 422:
@@ -373,7 +558,7 @@ async def _fetch_search_commits(
             stats.errors.append("commits: search validation error")
             return
         resp.raise_for_status()
-        stats.total_commits = resp.json().get("total_count", 0)
+        stats.total_commits = orjson.loads(resp.content).get("total_count", 0)
     except GitHubRateLimitError:
         raise
     except Exception as e:
@@ -386,17 +571,14 @@ async def _fetch_search_prs(
 ) -> None:
     """Fetch total PR count via search API."""
     try:
-        resp = await client.get(
-            "/search/issues",
-            params={"q": f"author:{username} type:pr", "per_page": 1},
-        )
+        resp = await client.get(_search_url("/search/issues", username, "type:pr"))
         if resp.status_code == 403:
             _check_rate_limit(resp)
         if resp.status_code == 422:
             stats.errors.append("prs: search validation error")
             return
         resp.raise_for_status()
-        stats.total_prs = resp.json().get("total_count", 0)
+        stats.total_prs = orjson.loads(resp.content).get("total_count", 0)
     except GitHubRateLimitError:
         raise
     except Exception as e:
@@ -410,8 +592,7 @@ async def _fetch_search_merged_prs(
     """Fetch merged PR count via search API."""
     try:
         resp = await client.get(
-            "/search/issues",
-            params={"q": f"author:{username} type:pr is:merged", "per_page": 1},
+            _search_url("/search/issues", username, "type:pr is:merged")
         )
         if resp.status_code == 403:
             _check_rate_limit(resp)
@@ -419,7 +600,7 @@ async def _fetch_search_merged_prs(
             stats.errors.append("merged_prs: search validation error")
             return
         resp.raise_for_status()
-        stats.total_prs_merged = resp.json().get("total_count", 0)
+        stats.total_prs_merged = orjson.loads(resp.content).get("total_count", 0)
     except GitHubRateLimitError:
         raise
     except Exception as e:
@@ -432,17 +613,14 @@ async def _fetch_search_issues(
 ) -> None:
     """Fetch total issue count via search API."""
     try:
-        resp = await client.get(
-            "/search/issues",
-            params={"q": f"author:{username} type:issue", "per_page": 1},
-        )
+        resp = await client.get(_search_url("/search/issues", username, "type:issue"))
         if resp.status_code == 403:
             _check_rate_limit(resp)
         if resp.status_code == 422:
             stats.errors.append("issues: search validation error")
             return
         resp.raise_for_status()
-        stats.total_issues = resp.json().get("total_count", 0)
+        stats.total_issues = orjson.loads(resp.content).get("total_count", 0)
     except GitHubRateLimitError:
         raise
     except Exception as e:
@@ -450,6 +628,13 @@ async def _fetch_search_issues(
         stats.errors.append(f"issues: {e}")
 
 
+@lru_cache(maxsize=4096)
+def _search_url(endpoint: str, username: str, qualifiers: str) -> str:
+    """Build an encoded search URL, cached since badges repeat the same users."""
+    query = f"author:{username} {qualifiers}".strip()
+    return f"{endpoint}?{urlencode({'q': query, 'per_page': 1})}"
+
+
 def _check_rate_limit(resp: httpx.Response) -> None:
     """Raise GitHubRateLimitError if response indicates rate limiting."""
     remaining = resp.headers.get("x-ratelimit-remaining", "")
@@ -2,16 +2,19 @@ import asyncio
 import hashlib
 import logging
 import os
+import time
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI, Query, Response
+from fastapi import FastAPI, Query, Request, Response
 
-from .cache import stats_cache
+from .cache import stats_cache, svg_cache
 from .github_fetcher import (
     GitHubRateLimitError,
     GitHubUserNotFoundError,
     UserStats,
+    create_graphql_client,
+    create_rest_client,
     fetch_user_stats,
     validate_username,
 )
@@ -22,45 +25,123 @@ from .themes import resolve_colors
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
-# Per-username locks to prevent duplicate concurrent fetches
-_fetch_locks: dict[str, asyncio.Lock] = {}
+# Cap on concurrent GitHub fetches across all usernames, so a burst of
+# distinct users can't drain the search rate limit all at once. The
+# semaphore itself is created per event loop, in lifespan.
+MAX_CONCURRENT_FETCHES = 16
+
+# In-flight fetches by cache key; concurrent requests for a user share one
+_inflight: dict[str, asyncio.Task[UserStats]] = {}
+
+# Background refreshes of stale entries, referenced so they aren't
+# garbage-collected before finishing
+_refresh_tasks: set[asyncio.Task] = set()
 
 ALLOWED_USERS_FILE = Path(__file__).parent.parent / "allowed_users.txt"
 
 
+# Parsed once at import, unlike the file below, which is re-read on change
+_ENV_ALLOWED_USERS = {
+    u.strip().lower()
+    for u in os.environ.get("ALLOWED_USERS", "").split(",")
+    if u.strip()
+}
+
+# (mtime_ns, parsed users) from the last read of ALLOWED_USERS_FILE
+_allowed_file_cache: tuple[int, set[str] | None] | None = None
+
+
 def _load_allowed_users() -> set[str] | None:
     """Load allowed usernames from env var or file. Returns None if no whitelist configured."""
+    global _allowed_file_cache
+
     # Check env var first
-    env_users = os.environ.get("ALLOWED_USERS", "").strip()
-    if env_users:
-        return {u.strip().lower() for u in env_users.split(",") if u.strip()}
+    if _ENV_ALLOWED_USERS:
+        return _ENV_ALLOWED_USERS
 
-    # Fall back to file
+    # Fall back to file, re-parsing only when it has changed
     try:
+        mtime = ALLOWED_USERS_FILE.stat().st_mtime_ns
+        if _allowed_file_cache is not None and _allowed_file_cache[0] == mtime:
+            return _allowed_file_cache[1]
         text = ALLOWED_USERS_FILE.read_text()
-        users = {line.strip().lower() for line in text.splitlines() if line.strip() and not line.strip().startswith("#")}
-        if users:
-            return users
     except FileNotFoundError:
-        pass
+        return None
 
-    return None
+    users = {line.strip().lower() for line in text.splitlines() if line.strip() and not line.strip().startswith("#")}
+    _allowed_file_cache = (mtime, users or None)
+    return users or None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Start background cache cleanup on startup."""
+    """Start background cache cleanup and shared GitHub clients on startup."""
     stats_cache.start_background_cleanup()
+    svg_cache.start_background_cleanup()
+    # Asyncio primitives and tasks belong to one event loop, so anything left
+    # by a previous lifespan (e.g. another TestClient) is dropped here
+    _inflight.clear()
+    _refresh_tasks.clear()
+    app.state.gh_sem = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+    app.state.gh_rest = create_rest_client()
+    app.state.gh_gql = create_graphql_client()
     logger.info("GitHub User Stats service started")
     yield
     logger.info("GitHub User Stats service shutting down")
+    await app.state.gh_rest.aclose()
+    await app.state.gh_gql.aclose()
 
 
 app = FastAPI(title="GitHub User Stats", lifespan=lifespan)
 
 
+async def _fetch_and_cache(cache_key: str, username: str) -> UserStats:
+    """Fetch stats from GitHub under the global concurrency cap and cache them."""
+    async with app.state.gh_sem:
+        stats = await fetch_user_stats(username, app.state.gh_rest, app.state.gh_gql)
+    stats_cache.set(cache_key, stats)
+    logger.info("Fetched fresh stats for %s", username)
+    return stats
+
+
+def _fetch_single_flight(cache_key: str, username: str) -> asyncio.Future[UserStats]:
+    """Join the in-flight fetch for `cache_key`, starting one if there is none."""
+    task = _inflight.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(_fetch_and_cache(cache_key, username))
+        _inflight[cache_key] = task
+        task.add_done_callback(lambda t: _forget_fetch(cache_key, t))
+    # Shield so one client disconnecting doesn't cancel the fetch for the rest
+    return asyncio.shield(task)
+
+
+def _forget_fetch(cache_key: str, task: asyncio.Task[UserStats]) -> None:
+    """Drop a finished fetch, marking its exception retrieved if nobody awaited it."""
+    _inflight.pop(cache_key, None)
+    if not task.cancelled():
+        task.exception()
+
+
+def _refresh_in_background(cache_key: str, username: str) -> None:
+    """Refresh a stale cache entry without making the caller wait for it."""
+    if cache_key in _inflight:
+        return
+    task = asyncio.create_task(_refresh(cache_key, username))
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+
+async def _refresh(cache_key: str, username: str) -> None:
+    """Refetch stats for a stale entry; failures keep serving the stale copy."""
+    try:
+        await _fetch_single_flight(cache_key, username)
+    except Exception as e:
+        logger.warning("Background refresh failed for %s: %s", username, e)
+
+
 @app.get("/api")
 async def get_stats(
+    request: Request,
     username: str = Query(..., description="GitHub username"),
     theme: str | None = Query(None, description="Color theme name"),
     title_color: str | None = Query(None, description="Title color hex"),
@@ -103,67 +184,110 @@ async def get_stats(
     hide_list = [s.strip() for s in hide.split(",") if s.strip()] if hide else []
     show_list = [s.strip() for s in show.split(",") if s.strip()] if show else []
 
-    # Try cache first
+    # Try cache first; stale entries are served while refreshing behind the scenes
     cache_key = f"stats:{username.lower()}"
-    stats = stats_cache.get(cache_key)
+    now = time.monotonic()
+    stats, needs_refresh = stats_cache.get_swr(cache_key, now)
 
     if stats is None:
-        # Dedup concurrent requests for same user
-        if username not in _fetch_locks:
-            _fetch_locks[username] = asyncio.Lock()
-
-        async with _fetch_locks[username]:
-            # Double-check cache after acquiring lock
-            stats = stats_cache.get(cache_key)
-            if stats is None:
-                try:
-                    stats = await fetch_user_stats(username)
-                    stats_cache.set(cache_key, stats)
-                    logger.info("Fetched fresh stats for %s", username)
-                except GitHubUserNotFoundError:
-                    svg = render_error_card(f"User '{username}' not found on GitHub", colors)
-                    return _svg_response(svg, cache_seconds=300)
-                except GitHubRateLimitError:
-                    # Try stale cache
-                    stale_stats, is_stale = stats_cache.get_with_stale(cache_key)
-                    if stale_stats is not None:
-                        stats = stale_stats
-                        logger.info("Serving stale cache for %s (rate limited)", username)
-                    else:
-                        svg = render_error_card("GitHub API rate limit exceeded. Try again later.", colors)
-                        return _svg_response(svg, cache_seconds=60)
-                except Exception:
-                    logger.exception("Unexpected error fetching stats for %s", username)
-                    svg = render_error_card("Failed to fetch GitHub data. Try again later.", colors)
-                    return _svg_response(svg, cache_seconds=60)
+        try:
+            # Concurrent requests for the same user share a single fetch
+            stats = await _fetch_single_flight(cache_key, username)
+        except GitHubUserNotFoundError:
+            svg = render_error_card(f"User '{username}' not found on GitHub", colors)
+            return _svg_response(svg, cache_seconds=300)
+        except GitHubRateLimitError:
+            # Nothing cached to fall back on: stale entries are served (and
+            # refreshed in the background) before a fetch is ever attempted
+            svg = render_error_card("GitHub API rate limit exceeded. Try again later.", colors)
+            return _svg_response(svg, cache_seconds=60)
+        except Exception:
+            logger.exception("Unexpected error fetching stats for %s", username)
+            svg = render_error_card("Failed to fetch GitHub data. Try again later.", colors)
+            return _svg_response(svg, cache_seconds=60)
+    elif needs_refresh:
+        logger.info("Serving stale stats for %s, refreshing", username)
+        _refresh_in_background(cache_key, username)
     else:
         logger.info("Serving cached stats for %s", username)
 
-    svg = render_stats_card(
-        stats=stats,
-        colors=colors,
-        show_icons=show_icons,
-        hide=hide_list,
-        show=show_list,
-        custom_title=custom_title,
-        hide_rank=hide_rank,
-        hide_title=hide_title,
-        hide_border=hide_border,
-        line_height=line_height,
-        disable_animations=disable_animations,
+    # The card depends only on the stats snapshot and the display options,
+    # so repeat requests for the same badge reuse the rendered bytes and ETag
+    options = (
+        colors,
+        show_icons,
+        hide_list,
+        show_list,
+        custom_title,
+        hide_rank,
+        hide_title,
+        hide_border,
+        line_height,
+        disable_animations,
     )
+    options_key = hashlib.blake2b(repr(options).encode(), digest_size=16).hexdigest()
+    svg_key = f"svg:{username.lower()}:{options_key}"
+    cached = svg_cache.get(svg_key, now)
+
+    if cached is not None and cached[0] is stats:
+        _, body, etag = cached
+    else:
+        svg = render_stats_card(
+            stats=stats,
+            colors=colors,
+            show_icons=show_icons,
+            hide=hide_list,
+            show=show_list,
+            custom_title=custom_title,
+            hide_rank=hide_rank,
+            hide_title=hide_title,
+            hide_border=hide_border,
+            line_height=line_height,
+            disable_animations=disable_animations,
+        )
+        # Encoded once here; cache hits reuse the bytes without re-encoding
+        body = svg.encode()
+        etag = _make_etag(body)
+        svg_cache.set(svg_key, (stats, body, etag))
+
+    # Badge proxies revalidate aggressively; answer those without a body
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(
+            status_code=304,
+            headers={"Cache-Control": "public, max-age=1800", "ETag": etag},
+        )
 
-    return _svg_response(svg, cache_seconds=1800)
+    return _svg_response(body, cache_seconds=1800, etag=etag)
 
 
-def _svg_response(svg: str, cache_seconds: int = 1800) -> Response:
+def _make_etag(body: bytes) -> str:
+    """Build a weak ETag for a response body."""
+    # Non-cryptographic use, so BLAKE2b (faster than MD5) and a weak ETag
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(",")
+    )
+
+
+def _svg_response(
+    svg: str | bytes, cache_seconds: int = 1800, etag: str | None = None
+) -> Response:
     """Create an SVG response with appropriate headers."""
-    etag = hashlib.md5(svg.encode()).hexdigest()
+    body = svg.encode() if isinstance(svg, str) else svg
     return Response(
-        content=svg,
+        content=body,
         media_type="image/svg+xml",
         headers={
             "Cache-Control": f"public, max-age={cache_seconds}",
-            "ETag": f'"{etag}"',
+            "ETag": etag or _make_etag(body),
         },
     )
@@ -1,8 +1,34 @@
 import math
 from dataclasses import dataclass
-
-
-@dataclass
+from functools import lru_cache
+
+COMMITS_MEDIAN = 250
+COMMITS_WEIGHT = 2
+PRS_MEDIAN = 50
+PRS_WEIGHT = 3
+ISSUES_MEDIAN = 25
+ISSUES_WEIGHT = 1
+REVIEWS_MEDIAN = 2
+REVIEWS_WEIGHT = 1
+STARS_MEDIAN = 50
+STARS_WEIGHT = 4
+FOLLOWERS_MEDIAN = 10
+FOLLOWERS_WEIGHT = 0.5
+
+TOTAL_WEIGHT = (
+    COMMITS_WEIGHT
+    + PRS_WEIGHT
+    + ISSUES_WEIGHT
+    + REVIEWS_WEIGHT
+    + STARS_WEIGHT
+    + FOLLOWERS_WEIGHT
+)
+
+_SQRT2 = math.sqrt(2)
+
+
+# Frozen because calculate_rank hands the same cached instance to every caller
+@dataclass(frozen=True, slots=True)
 class RankResult:
     level: str
     percentile: float
@@ -11,7 +37,7 @@ class RankResult:
 
 def _normal_cdf(x: float) -> float:
     """Standard normal cumulative distribution function."""
-    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+    return 0.5 * (1 + math.erf(x / _SQRT2))
 
 
 def _log_normal_cdf(x: float, mu: float = 0, sigma: float = 1) -> float:
@@ -28,6 +54,7 @@ def _exponential_cdf(x: float, lam: float = 1) -> float:
     return 1 - math.exp(-lam * x)
 
 
+@lru_cache(maxsize=4096)
 def calculate_rank(
     total_repos: int = 0,
     total_commits: int = 0,
@@ -40,30 +67,9 @@ def calculate_rank(
 ) -> RankResult:
     """Calculate user rank using weighted scoring with statistical CDFs.
 
-    Based on the algorithm from github-readme-stats.
+    Based on the algorithm from github-readme-stats. The result depends only
+    on the eight integer inputs, so it is memoized.
     """
-    COMMITS_MEDIAN = 250
-    COMMITS_WEIGHT = 2
-    PRS_MEDIAN = 50
-    PRS_WEIGHT = 3
-    ISSUES_MEDIAN = 25
-    ISSUES_WEIGHT = 1
-    REVIEWS_MEDIAN = 2
-    REVIEWS_WEIGHT = 1
-    STARS_MEDIAN = 50
-    STARS_WEIGHT = 4
-    FOLLOWERS_MEDIAN = 10
-    FOLLOWERS_WEIGHT = 0.5
-
-    total_weight = (
-        COMMITS_WEIGHT
-        + PRS_WEIGHT
-        + ISSUES_WEIGHT
-        + REVIEWS_WEIGHT
-        + STARS_WEIGHT
-        + FOLLOWERS_WEIGHT
-    )
-
     score = (
         COMMITS_WEIGHT * _exponential_cdf(total_commits / COMMITS_MEDIAN)
         + PRS_WEIGHT * _exponential_cdf(prs / PRS_MEDIAN)
@@ -71,7 +77,7 @@ def calculate_rank(
         + REVIEWS_WEIGHT * _exponential_cdf(reviews / REVIEWS_MEDIAN)
         + STARS_WEIGHT * _log_normal_cdf(stars / STARS_MEDIAN)
         + FOLLOWERS_WEIGHT * _log_normal_cdf(followers / FOLLOWERS_MEDIAN)
-    ) / total_weight
+    ) / TOTAL_WEIGHT
 
     # Score is 0-1, convert to percentile (100 = best)
     percentile = score * 100
@@ -1,9 +1,13 @@
+import math
+from functools import lru_cache
 from html import escape
 
 from .github_fetcher import UserStats
 from .icons import ICONS
 from .stats_calculator import RankResult, calculate_rank, k_format
-from .themes import ThemeColors
+from .themes import THEMES, ThemeColors
+
+_DEFAULT_ERROR_COLORS = THEMES["default"]
 
 
 def render_stats_card(
@@ -44,62 +48,119 @@ def render_stats_card(
     card_height = stats_start_y + len(stat_items) * line_height + 30
     card_height = max(card_height, 195 if not hide_rank else 150)
 
-    title = escape(custom_title or f"{stats.name}'s GitHub Stats")
+    # Only the user's name needs escaping in the default title
+    title = (
+        escape(custom_title)
+        if custom_title
+        else f"{escape(stats.name)}&#x27;s GitHub Stats"
+    )
 
     border_stroke = (
-        "" if hide_border else f'stroke="#{colors.border_color}" stroke-opacity="1"'
+        "" if hide_border else f'stroke="{colors.border_css}" stroke-opacity="1"'
     )
 
-    parts = [
-        f'<svg xmlns="http://www.w3.org/2000/svg" width="{card_width}" height="{card_height}" viewBox="0 0 {card_width} {card_height}" fill="none">',
-        _build_style(colors, disable_animations, line_height),
-        f'<rect x="0.5" y="0.5" rx="4.5" width="{card_width - 1}" height="{card_height - 1}" fill="#{colors.bg_color}" {border_stroke}/>',
-    ]
-
-    if not hide_title:
-        parts.append(
-            f'<g transform="translate(25, {title_y})">'
-            f'<text class="header" x="0" y="0" data-testid="header">{title}</text>'
-            f"</g>"
-        )
+    title_group = (
+        ""
+        if hide_title
+        else f'\n<g transform="translate(25, {title_y})">'
+        f'<text class="header" x="0" y="0" data-testid="header">{title}</text>'
+        f"</g>"
+    )
 
-    # Stat rows (with optional section headings)
-    for i, item in enumerate(stat_items):
-        y = stats_start_y + i * line_height
-        delay = i * 150
-        if item.get("type") == "heading":
-            parts.append(
-                _render_section_heading(item, y, colors, delay, disable_animations)
-            )
-        else:
-            parts.append(
-                _render_stat_row(item, y, show_icons, colors, delay, disable_animations)
-            )
+    # Stat rows (with optional section headings), staggered in by
+    # animation-delay unless animations are disabled
+    render_rows = _render_rows_static if disable_animations else _render_rows_animated
+    stat_rows = render_rows(
+        stat_items, stats_start_y, line_height, show_icons, colors.icon_css
+    )
+    # Rows are the only variable-length part; join them once and let the
+    # envelope below place the leading newline
+    rows_sep = "\n" if stat_rows else ""
+    rows = "\n".join(stat_rows)
 
     # Rank circle
-    if not hide_rank:
-        parts.append(_render_rank_circle(rank, colors, card_height, disable_animations))
+    rank_group = (
+        ""
+        if hide_rank
+        else "\n" + _render_rank_circle(rank, colors, card_height, disable_animations)
+    )
 
-    parts.append("</svg>")
-    return "\n".join(parts)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{card_width}" height="{card_height}" viewBox="0 0 {card_width} {card_height}" fill="none">\n'
+        f"{_build_style(colors, disable_animations)}\n"
+        f'<rect x="0.5" y="0.5" rx="4.5" width="{card_width - 1}" height="{card_height - 1}" fill="{colors.bg_css}" {border_stroke}/>'
+        f"{title_group}{rows_sep}{rows}{rank_group}\n"
+        "</svg>"
+    )
+
+
+def _render_rows_static(
+    stat_items: list[tuple[str, str, str]],
+    start_y: int,
+    line_height: int,
+    show_icons: bool,
+    icon_fill: str,
+) -> list[str]:
+    """Render stat rows as plain positioned groups."""
+    x_offset = 25 if show_icons else 0
+    heading = _HEADING
+    return [
+        (
+            f'<g transform="translate(25, {start_y + i * line_height})">'
+            f'<text class="section-heading" x="0" y="0">{value}</text>'
+            "</g>"
+        )
+        if label is heading
+        else (
+            f'<g transform="translate(25, {start_y + i * line_height})">'
+            f'{_render_icon(icon, icon_fill) if show_icons else ""}'
+            f'<text class="stat-label" x="{x_offset}" y="0">{label}:</text>'
+            f'<text class="stat-value" x="220" y="0">{value}</text>'
+            "</g>"
+        )
+        for i, (label, value, icon) in enumerate(stat_items)
+    ]
+
+
+def _render_rows_animated(
+    stat_items: list[tuple[str, str, str]],
+    start_y: int,
+    line_height: int,
+    show_icons: bool,
+    icon_fill: str,
+) -> list[str]:
+    """Render stat rows that fade in one after another."""
+    x_offset = 25 if show_icons else 0
+    heading = _HEADING
+    return [
+        (
+            f'<g class="stat-row" transform="translate(25, {start_y + i * line_height})"'
+            f' style="animation-delay: {i * 150}ms">'
+            f'<text class="section-heading" x="0" y="0">{value}</text>'
+            "</g>"
+        )
+        if label is heading
+        else (
+            f'<g class="stat-row" transform="translate(25, {start_y + i * line_height})"'
+            f' style="animation-delay: {i * 150}ms">'
+            f'{_render_icon(icon, icon_fill) if show_icons else ""}'
+            f'<text class="stat-label" x="{x_offset}" y="0">{label}:</text>'
+            f'<text class="stat-value" x="220" y="0">{value}</text>'
+            "</g>"
+        )
+        for i, (label, value, icon) in enumerate(stat_items)
+    ]
 
 
 def render_error_card(message: str, colors: ThemeColors | None = None) -> str:
     """Render an SVG error card."""
     if colors is None:
-        from .themes import THEMES
-
-        colors = THEMES["default"]
+        colors = _DEFAULT_ERROR_COLORS
 
     escaped_msg = escape(message)
     return (
         '<svg xmlns="http://www.w3.org/2000/svg" width="495" height="120" viewBox="0 0 495 120" fill="none">'
-        "<style>"
-        f'.header {{ font: 600 18px "Segoe UI", Ubuntu, Sans-Serif; fill: #{colors.title_color}; }}'
-        f'.message {{ font: 400 14px "Segoe UI", Ubuntu, Sans-Serif; fill: #{colors.text_color}; }}'
-        "</style>"
-        f'<rect x="0.5" y="0.5" rx="4.5" width="494" height="119" fill="#{colors.bg_color}" '
-        f'stroke="#{colors.border_color}"/>'
+        f"{_build_error_style(colors)}"
         '<g transform="translate(25, 35)">'
         '<text class="header">Error</text>'
         f'<text class="message" y="30">{escaped_msg}</text>'
@@ -108,116 +169,95 @@ def render_error_card(message: str, colors: ThemeColors | None = None) -> str:
     )
 
 
+@lru_cache(maxsize=64)
+def _build_error_style(colors: ThemeColors) -> str:
+    """Build the error card's style block and background (memoized)."""
+    return (
+        "<style>"
+        f'.header {{ font: 600 18px "Segoe UI", Ubuntu, Sans-Serif; fill: {colors.title_css}; }}'
+        f'.message {{ font: 400 14px "Segoe UI", Ubuntu, Sans-Serif; fill: {colors.text_css}; }}'
+        "</style>"
+        f'<rect x="0.5" y="0.5" rx="4.5" width="494" height="119" fill="{colors.bg_css}" '
+        f'stroke="{colors.border_css}"/>'
+    )
+
+
+# Label marking a section heading item; compared by identity
+_HEADING = "__heading__"
+
+# Stat row spec: (key, label, UserStats attribute, icon, shown by default).
+# Non-default rows appear only when requested via `show`; an attribute of
+# None marks the computed merged-PR percentage.
+_StatSpec = tuple[str, str, str | None, str, bool]
+
+_FLAT_SCHEMA: tuple[_StatSpec, ...] = (
+    ("stars", "Total Stars", "total_stars", "star", True),
+    ("commits", "Total Commits", "total_commits", "commits", True),
+    ("prs", "Total PRs", "total_prs", "prs", True),
+    ("issues", "Total Issues", "total_issues", "issues", True),
+    ("contribs", "Contributed to", "contributions", "contribs", True),
+    ("reviews", "Total Reviews", "total_reviews", "reviews", False),
+    ("prs_merged", "PRs Merged", "total_prs_merged", "prs", False),
+    ("prs_merged_percentage", "PRs Merged %", None, "prs", False),
+)
+
+# GraphQL stats are grouped into sections: all-time counts come from search
+# and the profile, recent ones from contributionsCollection
+_GRAPHQL_ALLTIME: tuple[_StatSpec, ...] = (
+    ("stars", "Total Stars", "total_stars", "star", True),
+    ("prs", "Total PRs", "total_prs", "prs", True),
+    ("prs_merged", "PRs Merged", "total_prs_merged", "prs", False),
+    ("prs_merged_percentage", "PRs Merged %", None, "prs", False),
+)
+_GRAPHQL_RECENT: tuple[_StatSpec, ...] = (
+    ("commits", "Total Commits", "total_commits", "commits", True),
+    ("issues", "Total Issues", "total_issues", "issues", True),
+    ("contribs", "Contributed to", "contributions", "contribs", True),
+    ("reviews", "Total Reviews", "total_reviews", "reviews", False),
+)
+_GRAPHQL_SECTIONS = (
+    ("All Time", _GRAPHQL_ALLTIME),
+    ("Last 12 Months", _GRAPHQL_RECENT),
+)
+
+
 def _build_stat_items(
     stats: UserStats, hide_set: set[str], show_set: set[str]
-) -> list[dict]:
+) -> list[tuple[str, str, str]]:
     """Build the list of stat items to display.
 
-    When stats come from GraphQL, items are grouped under
-    'All Time' and 'Last 12 Months' section headings.
+    Items are (label, display value, icon) string tuples. When stats come
+    from GraphQL, items are grouped under 'All Time' and 'Last 12 Months'
+    section headings, which are (_HEADING, heading label, "").
     """
-    if stats.from_graphql:
-        return _build_stat_items_graphql(stats, hide_set, show_set)
-    return _build_stat_items_flat(stats, hide_set, show_set)
-
+    if not stats.from_graphql:
+        return _build_schema_items(stats, _FLAT_SCHEMA, hide_set, show_set)
 
-def _build_stat_items_flat(
-    stats: UserStats, hide_set: set[str], show_set: set[str]
-) -> list[dict]:
-    """Build a flat list of stat items (REST fallback)."""
     items = []
-
-    default_stats = [
-        ("stars", "Total Stars", stats.total_stars, "star"),
-        ("commits", "Total Commits", stats.total_commits, "commits"),
-        ("prs", "Total PRs", stats.total_prs, "prs"),
-        ("issues", "Total Issues", stats.total_issues, "issues"),
-        ("contribs", "Contributed to", stats.contributions, "contribs"),
-    ]
-
-    optional_stats = [
-        ("reviews", "Total Reviews", stats.total_reviews, "reviews"),
-        ("prs_merged", "PRs Merged", stats.total_prs_merged, "prs"),
-        (
-            "prs_merged_percentage",
-            "PRs Merged %",
-            _calc_merged_pct(stats.total_prs_merged, stats.total_prs),
-            "prs",
-        ),
-    ]
-
-    for key, label, value, icon in default_stats:
-        if key not in hide_set:
-            display = k_format(value) if isinstance(value, int) else value
-            items.append({"label": label, "value": display, "icon": icon})
-
-    for key, label, value, icon in optional_stats:
-        if key in show_set:
-            display = k_format(value) if isinstance(value, int) else value
-            items.append({"label": label, "value": display, "icon": icon})
-
+    for heading, schema in _GRAPHQL_SECTIONS:
+        rows = _build_schema_items(stats, schema, hide_set, show_set)
+        if rows:
+            items.append((_HEADING, heading, ""))
+            items.extend(rows)
     return items
 
 
-def _build_stat_items_graphql(
-    stats: UserStats, hide_set: set[str], show_set: set[str]
-) -> list[dict]:
-    """Build stat items grouped into All Time / Last 12 Months sections."""
+def _build_schema_items(
+    stats: UserStats,
+    schema: tuple[_StatSpec, ...],
+    hide_set: set[str],
+    show_set: set[str],
+) -> list[tuple[str, str, str]]:
+    """Build the visible stat items for one schema."""
     items = []
-
-    # --- All Time (from search + profile) ---
-    alltime_stats = [
-        ("stars", "Total Stars", stats.total_stars, "star"),
-        ("prs", "Total PRs", stats.total_prs, "prs"),
-    ]
-    alltime_optional = [
-        ("prs_merged", "PRs Merged", stats.total_prs_merged, "prs"),
-        (
-            "prs_merged_percentage",
-            "PRs Merged %",
-            _calc_merged_pct(stats.total_prs_merged, stats.total_prs),
-            "prs",
-        ),
-    ]
-
-    alltime_rows = []
-    for key, label, value, icon in alltime_stats:
-        if key not in hide_set:
-            display = k_format(value) if isinstance(value, int) else value
-            alltime_rows.append({"label": label, "value": display, "icon": icon})
-    for key, label, value, icon in alltime_optional:
-        if key in show_set:
-            display = k_format(value) if isinstance(value, int) else value
-            alltime_rows.append({"label": label, "value": display, "icon": icon})
-
-    if alltime_rows:
-        items.append({"type": "heading", "label": "All Time"})
-        items.extend(alltime_rows)
-
-    # --- Last 12 Months (from contributionsCollection) ---
-    recent_stats = [
-        ("commits", "Total Commits", stats.total_commits, "commits"),
-        ("issues", "Total Issues", stats.total_issues, "issues"),
-        ("contribs", "Contributed to", stats.contributions, "contribs"),
-    ]
-    recent_optional = [
-        ("reviews", "Total Reviews", stats.total_reviews, "reviews"),
-    ]
-
-    recent_rows = []
-    for key, label, value, icon in recent_stats:
-        if key not in hide_set:
-            display = k_format(value) if isinstance(value, int) else value
-            recent_rows.append({"label": label, "value": display, "icon": icon})
-    for key, label, value, icon in recent_optional:
-        if key in show_set:
-            display = k_format(value) if isinstance(value, int) else value
-            recent_rows.append({"label": label, "value": display, "icon": icon})
-
-    if recent_rows:
-        items.append({"type": "heading", "label": "Last 12 Months"})
-        items.extend(recent_rows)
-
+    for key, label, attr, icon, is_default in schema:
+        if (key in hide_set) if is_default else (key not in show_set):
+            continue
+        if attr is None:
+            value = _calc_merged_pct(stats.total_prs_merged, stats.total_prs)
+        else:
+            value = k_format(getattr(stats, attr))
+        items.append((label, value, icon))
     return items
 
 
@@ -228,13 +268,7 @@ def _calc_merged_pct(merged: int, total: int) -> str:
     return f"{(merged / total) * 100:.1f}%"
 
 
-def _build_style(
-    colors: ThemeColors, disable_animations: bool, line_height: int
-) -> str:
-    """Build the CSS style block."""
-    animation_css = ""
-    if not disable_animations:
-        animation_css = """
+_ANIMATION_CSS = """
       @keyframes fadeInAnimation {
         from { opacity: 0; }
         to { opacity: 1; }
@@ -261,93 +295,64 @@ def _build_style(
         animation: scaleInAnimation 0.3s ease-in-out forwards;
       }"""
 
+
+@lru_cache(maxsize=64)
+def _build_style(colors: ThemeColors, disable_animations: bool) -> str:
+    """Build the CSS style block (memoized; only colors and flags vary)."""
+    animation_css = "" if disable_animations else _ANIMATION_CSS
+
     return (
         "<style>"
-        f'.header {{ font: 600 18px "Segoe UI", Ubuntu, Sans-Serif; fill: #{colors.title_color}; animation: fadeInAnimation 0.8s ease-in-out forwards; }}'
-        f'.stat-label {{ font: 400 14px "Segoe UI", Ubuntu, Sans-Serif; fill: #{colors.text_color}; }}'
-        f'.stat-value {{ font: 700 14px "Segoe UI", Ubuntu, Sans-Serif; fill: #{colors.text_color}; }}'
-        f'.section-heading {{ font: 700 14px "Segoe UI", Ubuntu, Sans-Serif; fill: #{colors.text_color}; }}'
-        f'.rank-letter {{ font: 800 24px "Segoe UI", Ubuntu, Sans-Serif; fill: #{colors.text_color}; }}'
-        f'.rank-percentile {{ font: 400 12px "Segoe UI", Ubuntu, Sans-Serif; fill: #{colors.text_color}; }}'
-        f'.percentage {{ font: 400 12px "Segoe UI", Ubuntu, Sans-Serif; fill: #{colors.text_color}; }}'
+        f'.header {{ font: 600 18px "Segoe UI", Ubuntu, Sans-Serif; fill: {colors.title_css}; animation: fadeInAnimation 0.8s ease-in-out forwards; }}'
+        f'.stat-label {{ font: 400 14px "Segoe UI", Ubuntu, Sans-Serif; fill: {colors.text_css}; }}'
+        f'.stat-value {{ font: 700 14px "Segoe UI", Ubuntu, Sans-Serif; fill: {colors.text_css}; }}'
+        f'.section-heading {{ font: 700 14px "Segoe UI", Ubuntu, Sans-Serif; fill: {colors.text_css}; }}'
+        f'.rank-letter {{ font: 800 24px "Segoe UI", Ubuntu, Sans-Serif; fill: {colors.text_css}; }}'
+        f'.rank-percentile {{ font: 400 12px "Segoe UI", Ubuntu, Sans-Serif; fill: {colors.text_css}; }}'
+        f'.percentage {{ font: 400 12px "Segoe UI", Ubuntu, Sans-Serif; fill: {colors.text_css}; }}'
         f"{animation_css}"
         "</style>"
     )
 
 
-def _render_section_heading(
-    item: dict, y: int, colors: ThemeColors, delay: int, disable_animations: bool
-) -> str:
-    """Render a bold section heading row."""
-    anim_style = "" if disable_animations else f' style="animation-delay: {delay}ms"'
-    row_class = "stat-row" if not disable_animations else ""
-
+@lru_cache(maxsize=256)
+def _render_icon(icon: str, icon_fill: str) -> str:
+    """Render an icon's <svg> element; constant per icon and color, so memoized."""
+    icon_path = ICONS.get(icon, "")
+    if not icon_path:
+        return ""
     return (
-        f'<g class="{row_class}" transform="translate(25, {y})"{anim_style}>'
-        f'<text class="section-heading" x="0" y="0">{escape(item["label"])}</text>'
-        f"</g>"
+        f'<svg x="0" y="-13" width="16" height="16" viewBox="0 0 16 16" fill="{icon_fill}">'
+        f'<path d="{icon_path}"/>'
+        f"</svg>"
     )
 
 
-def _render_stat_row(
-    item: dict,
-    y: int,
-    show_icons: bool,
-    colors: ThemeColors,
-    delay: int,
-    disable_animations: bool,
-) -> str:
-    """Render a single stat row."""
-    anim_style = "" if disable_animations else f' style="animation-delay: {delay}ms"'
-    row_class = "stat-row" if not disable_animations else ""
-
-    parts = [f'<g class="{row_class}" transform="translate(25, {y})"{anim_style}>']
-
-    x_offset = 0
-    if show_icons:
-        icon_path = ICONS.get(item["icon"], "")
-        if icon_path:
-            parts.append(
-                f'<svg x="0" y="-13" width="16" height="16" viewBox="0 0 16 16" fill="#{colors.icon_color}">'
-                f'<path d="{icon_path}"/>'
-                f"</svg>"
-            )
-        x_offset = 25
-
-    parts.append(
-        f'<text class="stat-label" x="{x_offset}" y="0">{escape(item["label"])}:</text>'
-    )
-    parts.append(
-        f'<text class="stat-value" x="220" y="0">{escape(str(item["value"]))}</text>'
-    )
-    parts.append("</g>")
-
-    return "".join(parts)
+# Rank circle geometry
+_RANK_CX = 425
+_RANK_RADIUS = 40
+_RANK_CIRCUMFERENCE = 2 * math.pi * _RANK_RADIUS
+_RANK_DASHARRAY = f'stroke-dasharray="{_RANK_CIRCUMFERENCE}"'
 
 
 def _render_rank_circle(
     rank: RankResult, colors: ThemeColors, card_height: int, disable_animations: bool
 ) -> str:
     """Render the rank circle on the right side of the card."""
-    cx = 425
     cy = card_height / 2
-    r = 40
-    circumference = 2 * 3.14159 * r
-    progress = (rank.percentile / 100) * circumference
-    dashoffset = circumference - progress
-
-    anim_attr = "" if disable_animations else ""
+    dashoffset = _RANK_CIRCUMFERENCE * (1 - rank.percentile / 100)
     rank_circle_class = "rank-circle-rim" if not disable_animations else ""
 
     return (
-        f'<g transform="translate({cx}, {cy})">'
-        f'<circle r="{r}" cx="0" cy="0" fill="none" stroke="#{colors.text_color}" stroke-width="6" stroke-opacity="0.2"/>'
-        f'<circle class="{rank_circle_class}" r="{r}" cx="0" cy="0" fill="none" '
-        f'stroke="#{colors.icon_color}" stroke-width="6" '
-        f'stroke-dasharray="{circumference}" stroke-dashoffset="{dashoffset}" '
+        f'<g transform="translate({_RANK_CX}, {cy})">'
+        f'<circle r="{_RANK_RADIUS}" cx="0" cy="0" fill="none" stroke="{colors.text_css}" stroke-width="6" stroke-opacity="0.2"/>'
+        f'<circle class="{rank_circle_class}" r="{_RANK_RADIUS}" cx="0" cy="0" fill="none" '
+        f'stroke="{colors.icon_css}" stroke-width="6" '
+        f"{_RANK_DASHARRAY} "
+        f'stroke-dashoffset="{dashoffset}" '
         f'stroke-linecap="round" transform="rotate(-90)"/>'
         f'<text class="rank-letter" text-anchor="middle" dominant-baseline="central" y="-5">'
-        f"{escape(rank.level)}</text>"
+        f"{rank.level}</text>"
         f'<text class="rank-percentile" text-anchor="middle" dominant-baseline="central" y="15">'
         f"Top {rank.percentage}%</text>"
         f"</g>"
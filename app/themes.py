@@ -1,7 +1,9 @@
 from dataclasses import dataclass
+from functools import cached_property
 
 
-@dataclass
+# Frozen so colors are hashable and can key the renderer's style caches
+@dataclass(frozen=True)
 class ThemeColors:
     title_color: str
     text_color: str
@@ -9,6 +11,27 @@ class ThemeColors:
     bg_color: str
     border_color: str
 
+    # "#rrggbb" forms for writing straight into SVG, computed once per instance
+    @cached_property
+    def title_css(self) -> str:
+        return "#" + self.title_color
+
+    @cached_property
+    def text_css(self) -> str:
+        return "#" + self.text_color
+
+    @cached_property
+    def icon_css(self) -> str:
+        return "#" + self.icon_color
+
+    @cached_property
+    def bg_css(self) -> str:
+        return "#" + self.bg_color
+
+    @cached_property
+    def border_css(self) -> str:
+        return "#" + self.border_color
+
 
 THEMES: dict[str, ThemeColors] = {
     "default": ThemeColors(
@@ -388,6 +411,9 @@ def resolve_colors(
 ) -> ThemeColors:
     """Resolve final colors: start with theme, override with explicit params."""
     base = THEMES.get(theme or "default", THEMES["default"])
+    if not (title_color or text_color or icon_color or bg_color or border_color):
+        # Reuse the shared theme so its cached color strings carry over
+        return base
     return ThemeColors(
         title_color=title_color or base.title_color,
         text_color=text_color or base.text_color,